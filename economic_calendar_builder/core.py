@@ -12,10 +12,12 @@ Commands:
 
 Artifacts are written to the current directory (flat). State is tracked in state.json.
 """
-import argparse, json, os, sys, re, time, gzip, hashlib, tarfile
+import argparse, functools, json, os, sys, re, time, gzip, hashlib, tarfile
+from dataclasses import dataclass
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 import yaml
 
@@ -24,11 +26,36 @@ STATE = HERE / "state.json"
 
 # --- Helpers ---
 def sha256_file(p: Path) -> str:
-    h=hashlib.sha256()
     with open(p, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
+        if hasattr(hashlib, "file_digest"):  # 3.11+: digest loop runs in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
+
+class _HashWriter:
+    """File-like sink that hashes written text instead of buffering it."""
+    def __init__(self):
+        self.h = hashlib.sha256()
+    def write(self, b):
+        self.h.update(b.encode("utf-8") if isinstance(b, str) else b)
+        return len(b)
+
+@functools.lru_cache(maxsize=128)
+def _zi(name: str) -> ZoneInfo:
+    """ZoneInfo parsed once per unique tz name (TZif load is not cheap)."""
+    return ZoneInfo(name)
+
+@functools.lru_cache(maxsize=128)
+def _tz_ok(name: str) -> bool:
+    if not name:
+        return False
+    try:
+        _zi(name)
+        return True
+    except Exception:
+        return False
 
 def _to_utc_iso(date_local:str, time_local:str|None, tzname:str|None) -> str:
     from datetime import datetime, time, timezone, timedelta
@@ -43,7 +70,7 @@ def _to_utc_iso(date_local:str, time_local:str|None, tzname:str|None) -> str:
     naive = datetime(d.year, d.month, d.day, t.hour, t.minute, 0)
     if tzname:
         try:
-            tzinfo = ZoneInfo(tzname)
+            tzinfo = _zi(tzname)
         except Exception:
             print(f"[warn] invalid tz '{tzname}', fallback UTC", file=sys.stderr)
             tzinfo = timezone.utc
@@ -56,7 +83,73 @@ def _to_utc_iso(date_local:str, time_local:str|None, tzname:str|None) -> str:
         dt_utc = (local + timedelta(hours=1)).astimezone(timezone.utc)
     return dt_utc.replace(tzinfo=timezone.utc).isoformat()
 
+def _sniff_csv_encoding(sample: bytes) -> str:
+    """Pick an encoding from BOM / decode probes on a small sample."""
+    import codecs
+    if sample.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return 'utf-32'
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode('cp1251')
+        return 'cp1251'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def _to_utc_iso_batch(date_s: pd.Series, time_s: pd.Series, tz_eff: pd.Series) -> pd.Series:
+    """Vectorized _to_utc_iso: localize per tz group and ISO-format in C.
+
+    `tz_eff` must hold valid tz names ('UTC' for rows that fall back).
+    Times parse like the scalar path (split on ':', int() the first two
+    tokens) and collapse to midnight unless that yields a valid HH:MM;
+    nonexistent local times shift +1h and ambiguous ones take fold=0.
+    """
+    # int() accepts surrounding whitespace, a sign and digit-group underscores
+    # but not decimals or trailing junk, so gate each token on an
+    # integer-literal match first
+    tok = time_s.astype(str).str.split(':', n=2, expand=True).reindex(columns=[0, 1])
+    _int_tok = r'\s*[+-]?\d+(?:_\d+)*\s*'
+    hh = pd.to_numeric(tok[0].where(tok[0].str.fullmatch(_int_tok, na=False)).str.replace('_', ''), errors='coerce')
+    mm = pd.to_numeric(tok[1].where(tok[1].str.fullmatch(_int_tok, na=False)).str.replace('_', ''), errors='coerce')
+    ok = hh.between(0, 23) & mm.between(0, 59)
+    hhmm = pd.Series('00:00', index=time_s.index, dtype=object)
+    if ok.any():
+        hhmm[ok] = (hh[ok].astype(int).astype(str).str.zfill(2) + ':' +
+                    mm[ok].astype(int).astype(str).str.zfill(2))
+    naive = pd.to_datetime(date_s + ' ' + hhmm, format='%Y-%m-%d %H:%M', errors='coerce')
+    naive = naive.fillna(pd.to_datetime(date_s, format='%Y-%m-%d', errors='coerce'))
+    iso = pd.Series('', index=date_s.index, dtype=object)
+    for tzname, idx in naive.groupby(tz_eff).groups.items():
+        loc = naive.loc[idx].dt.tz_localize(tzname, nonexistent=pd.Timedelta(hours=1), ambiguous=True)
+        iso.loc[idx] = loc.dt.tz_convert('UTC').dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+    return iso
+
 def _read_csv_with_fallback(infile: Path):
+    """Sniff encoding+delimiter on a 64 KiB sample, then read once with the C engine.
+
+    The historical multi-encoding python-engine loop is kept as a last resort.
+    """
+    import csv
+    try:
+        with open(infile, 'rb') as f:
+            sample = f.read(65536)
+        enc = _sniff_csv_encoding(sample)
+        text = sample.decode(enc, errors='replace')
+        try:
+            sep = csv.Sniffer().sniff(text[:4096], delimiters=',;\t|').delimiter
+        except csv.Error:
+            sep = ','
+        df = pd.read_csv(infile, sep=sep, engine='c', dtype=str, encoding=enc)
+        return df, enc
+    except Exception:
+        pass
     encodings = ['utf-8','utf-8-sig','cp1251','latin-1']
     last_err = None
     for enc in encodings:
@@ -87,23 +180,19 @@ def _ensure_columns(df):
     return df, required, optional
 
 def _drop_invalid_rows(df, required):
-    from datetime import datetime
     total = len(df)
     df['importance'] = df['importance'].astype(str).str.strip().str.lower()
     allowed = {'medium','high'}
     mask_imp = df['importance'].isin(allowed)
-    def _is_date_ok(s):
-        s = str(s).strip()
-        try:
-            datetime.strptime(s, '%Y-%m-%d'); return True
-        except Exception:
-            return False
-    mask_date = df['date_local'].map(_is_date_ok)
-    mask_req = pd.Series(True, index=df.index)
-    for c in required:
-        mask_req &= df[c].astype(str).str.strip().ne('')
+    mask_date = pd.to_datetime(df['date_local'].astype(str).str.strip(),
+                               format='%Y-%m-%d', errors='coerce').notna()
+    mask_req = df[required].apply(lambda s: s.astype(str).str.strip()).ne('').all(axis=1)
     keep = mask_imp & mask_date & mask_req
     out = df.loc[keep].copy().reset_index(drop=True)
+    # few unique values -> categorical: cheaper isin/value_counts/groupby downstream
+    for c in ('country', 'importance'):
+        if c in out.columns:
+            out[c] = out[c].astype('category')
     stats = {'total_rows': int(total), 'kept_rows': int(len(out)), 'dropped_rows': int((~keep).sum()),
              'dropped_reasons': {'bad_importance_or_low': int((~mask_imp).sum()),
                                  'bad_date_format': int((~mask_date).sum()),
@@ -125,12 +214,33 @@ def canonicalize_tz(tz_str: str|None, cfg: dict) -> str|None:
     }
     return aliases.get(tz_s) or aliases.get(tz_s.upper()) or builtins.get(tz_s.upper()) or tz_s
 
-def load_config_dict() -> dict:
+def _config_stamp() -> tuple:
+    """(mtime_ns, size) of config.yaml — cache key that changes when the file does."""
+    try:
+        st = (HERE/"config.yaml").stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (0, 0)
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(mtime_ns: int, size: int) -> dict:
     try:
         return yaml.safe_load((HERE/"config.yaml").read_text(encoding="utf-8")) or {}
     except Exception:
         return {}
 
+def load_config_dict() -> dict:
+    return _load_config_cached(*_config_stamp())
+
+def _config_memo(fn):
+    """Memoize a zero-arg config getter; invalidated when config.yaml changes."""
+    cached = functools.lru_cache(maxsize=4)(lambda stamp: fn())
+    @functools.wraps(fn)
+    def wrapper():
+        return cached(_config_stamp())
+    return wrapper
+
+@_config_memo
 def get_official_domains():
     """Return set of official domains from config.yaml; fallback to built-in default."""
     cfg = load_config_dict()
@@ -150,6 +260,7 @@ def get_official_domains():
         'ismworld.org','spglobal.com','pmi.spglobal.com'
     }
 
+@_config_memo
 def get_exclusions():
     """Return dict: {CC: {'titles_exact': set(), 'weekly_series': set()}}."""
     cfg = load_config_dict()
@@ -164,19 +275,23 @@ def get_exclusions():
     return norm
 
 
+_HOST_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:)?//([^/:?#]+)', re.I)
+
+@functools.lru_cache(maxsize=4096)
 def _domain_from_url(url: str) -> str:
     """Return normalized host without 'www.' and port, lowercased."""
     try:
-        from urllib.parse import urlparse
-        host = urlparse(str(url)).netloc.lower()
-        if ':' in host:
-            host = host.split(':',1)[0]
+        m = _HOST_RE.match(str(url))
+        if not m:
+            return ''
+        host = m.group(1).lower()
         if host.startswith('www.'):
             host = host[4:]
         return host
     except Exception:
         return ''
 
+@_config_memo
 def get_govlike_patterns():
     """Return list of regex patterns from config.yaml (gov_like_patterns) or sensible defaults."""
     try:
@@ -211,22 +326,49 @@ def get_govlike_patterns():
         r'.*\.snb\.ch$',
     ]
 
+@_config_memo
+def get_govlike_patterns_compiled():
+    """Compiled versions of get_govlike_patterns(); invalid patterns kept raw for the search fallback."""
+    out = []
+    for p in get_govlike_patterns():
+        try:
+            out.append(re.compile(p))
+        except re.error:
+            out.append(p)
+    return out
+
+_SUFFIX_SETS: dict = {}
+
+def _suffix_set(bases) -> frozenset:
+    """Normalized suffix set for a base-domain collection, cached per collection object."""
+    key = id(bases)
+    hit = _SUFFIX_SETS.get(key)
+    if hit is not None and hit[0] is bases:
+        return hit[1]
+    s = frozenset(str(b).lower().lstrip('.') for b in bases)
+    if len(_SUFFIX_SETS) > 64:
+        _SUFFIX_SETS.clear()
+    _SUFFIX_SETS[key] = (bases, s)
+    return s
+
 def _is_officialish_host(host: str, official_domains: set[str]|list[str]|None=None, govlike_pats: list[str]|None=None, alias_domains: set[str]|list[str]|None=None, canonical_map: dict[str,str]|None=None) -> bool:
     host = _canonicalize_host((host or '').lower(), canonical_map)
     if not host:
         return False
-    def _match_base(host, base):
-        base = str(base).lower().lstrip('.')
-        return host == base or host.endswith('.'+base)
-    if official_domains:
-        for base in official_domains:
-            if _match_base(host, base):
-                return True
-    if alias_domains:
-        for base in alias_domains:
-            if _match_base(host, base):
+    if official_domains or alias_domains:
+        off = _suffix_set(official_domains) if official_domains else frozenset()
+        ali = _suffix_set(alias_domains) if alias_domains else frozenset()
+        # probe host and each parent suffix: O(labels) set lookups instead of O(domains) endswith scans
+        parts = host.split('.')
+        for i in range(len(parts)):
+            suf = '.'.join(parts[i:])
+            if suf in off or suf in ali:
                 return True
     for p in (govlike_pats or []):
+        if isinstance(p, re.Pattern):
+            if p.fullmatch(host):
+                return True
+            continue
         try:
             if re.fullmatch(p, host):
                 return True
@@ -235,6 +377,16 @@ def _is_officialish_host(host: str, official_domains: set[str]|list[str]|None=No
                 return True
     return False
 
+@functools.lru_cache(maxsize=4096)
+def _officialish_cached_key(host: str, stamp: tuple) -> bool:
+    return _is_officialish_host(host, get_official_domains(), get_govlike_patterns_compiled(),
+                                get_alias_domains(), get_canonical_host_map())
+
+def _officialish_cached(host: str) -> bool:
+    """Memoized full-union officialish check (official ∪ alias ∪ gov-like); invalidated with config.yaml."""
+    return _officialish_cached_key(host, _config_stamp())
+
+@_config_memo
 def get_alias_domains():
     try:
         cfg = load_config_dict()
@@ -243,6 +395,7 @@ def get_alias_domains():
     except Exception:
         return []
 
+@_config_memo
 def get_canonical_host_map():
     try:
         cfg = load_config_dict()
@@ -357,14 +510,13 @@ def _apply_exclusions(df: pd.DataFrame) -> pd.DataFrame:
     exc = get_exclusions()
     if df.empty or not exc:
         return df
-    def _drop(row):
-        cc = str(row.get('country','')).strip().upper()
-        title = str(row.get('title','')).strip().lower()
-        b = exc.get(cc, {})
-        if title in (b.get('titles_exact') or set()): return True
-        if title in (b.get('weekly_series') or set()): return True
-        return False
-    mask = df.apply(_drop, axis=1)
+    excl_pairs = [(cc, t) for cc, b in exc.items()
+                  for t in ((b.get('titles_exact') or set()) | (b.get('weekly_series') or set()))]
+    if not excl_pairs:
+        return df
+    cc = df['country'].astype(str).str.strip().str.upper()
+    tt = df['title'].astype(str).str.strip().str.lower()
+    mask = pd.MultiIndex.from_arrays([cc, tt]).isin(excl_pairs)
     dropped = int(mask.sum())
     if dropped:
         print(f"[exclusions] dropped {dropped} rows")
@@ -399,6 +551,11 @@ def _compile_importance_rules(cfg: dict) -> list[dict]:
         pass
     return items
 
+@functools.lru_cache(maxsize=4)
+def _compiled_importance_rules_cached(stamp: tuple) -> tuple:
+    """Compiled importance rules, re-built only when config.yaml changes."""
+    return tuple(_compile_importance_rules(load_config_dict()))
+
 def _apply_importance_rules(df: pd.DataFrame) -> pd.DataFrame:
     """
     1) honor notes override like 'impact_override=high' (key is configurable via config.yaml)
@@ -408,39 +565,58 @@ def _apply_importance_rules(df: pd.DataFrame) -> pd.DataFrame:
     cfg = load_config_dict()
     notes_key = str(((cfg.get("importance_rules") or {}).get("notes_override_key")) or "impact_override").strip()
     allowed = set((cfg.get("include_impacts") or ["high","medium"]))
-    rules = _compile_importance_rules(cfg)
+    rules = _compiled_importance_rules_cached(_config_stamp())
 
-    def derive(row):
-        imp = str(row.get("importance","")).strip().lower()
-        title = str(row.get("title","")).strip()
-        cc = str(row.get("country","")).strip().upper()
-        notes = str(row.get("notes",""))
-
-        # 1) notes override: key=value anywhere in notes
-        if notes_key:
-            m = re.search(rf'{re.escape(notes_key)}\s*=\s*(high|medium)', notes, re.I)
-            if m:
-                return m.group(1).lower()
-
-        # 2) rules: first match wins
+    df = df.copy()
+    imp = df["importance"].astype(str).str.strip().str.lower()
+    derived = imp
+
+    # 2) rules: first match wins (np.select takes the first true condition)
+    if rules:
+        titles = df["title"].astype(str).str.strip()
+        cc = df["country"].astype(str).str.strip().str.upper()
+        conds, choices = [], []
         for it in rules:
-            if it.get("country") and it["country"] != cc:
-                continue
+            m = pd.Series(True, index=df.index)
+            if it.get("country"):
+                m &= cc.eq(it["country"])
             rx = it.get("title_re")
-            if rx is not None and not rx.search(title):
-                continue
-            # match!
-            return it.get("set","").lower() or imp
-
-        return imp
-
-    df = df.copy()
-    df["importance"] = df.apply(derive, axis=1).astype(str).str.strip().str.lower()
+            if rx is not None:
+                m &= titles.str.contains(rx, regex=True, na=False)
+            conds.append(m.to_numpy())
+            choices.append(it["set"])
+        sel = pd.Series(np.select(conds, choices, default=""), index=df.index)
+        derived = derived.mask(sel.ne(""), sel)
+
+    # 1) notes override: key=value anywhere in notes, wins over rules
+    if notes_key:
+        ov = df["notes"].astype(str).str.extract(
+            rf'(?i){re.escape(notes_key)}\s*=\s*(high|medium)', expand=False).str.lower()
+        derived = ov.fillna(derived)
+
+    df["importance"] = derived.astype(str).str.strip().str.lower()
     # clamp to allowed
     df["importance"] = df["importance"].where(df["importance"].isin(allowed), next(iter(allowed)))
     return df
 
 
+_WS_RE = re.compile(r'\s+')
+_SLASH_DASH_RE = re.compile(r'\s*([/-])\s*')
+
+def _canon_title_vec(s: pd.Series) -> pd.Series:
+    """Vectorized title canonicalization used for the dedup key."""
+    s = s.fillna('').astype(str).str.strip().str.lower()
+    s = s.str.replace('–', '-', regex=False).str.replace('—', '-', regex=False)
+    s = s.str.replace(_WS_RE, ' ', regex=True)
+    s = s.str.replace(_SLASH_DASH_RE, r' \1 ', regex=True)
+    return s.str.strip()
+
+def _dedup_key(df: pd.DataFrame) -> pd.Series:
+    """date_local + country + canonical title, built with vectorized string ops."""
+    return (df['date_local'].astype(str).str[:10] + '|' +
+            df['country'].astype(str).str.strip().str.upper() + '|' +
+            _canon_title_vec(df['title']))
+
 def stage_validate(year:int, infile:Path):
     df, enc = _read_csv_with_fallback(infile)
     df = _normalize_headers(df)
@@ -454,18 +630,7 @@ def stage_validate(year:int, infile:Path):
     # exclusions
     df = _apply_exclusions(df)
     # simple deduplication: date_local + title + country
-    import re as _re
-    def _canon_title(_s: str) -> str:
-        _s = str(_s or '').strip().lower()
-        _s = _s.replace('–','-').replace('—','-')
-        _s = _re.sub(r'\s+', ' ', _s)
-        _s = _re.sub(r'\s*([/-])\s*', r' \1 ', _s)
-        return _s.strip()
-    df['__dedup_key'] = (
-        df['date_local'].astype(str).str[:10] + '|' +
-        df['country'].astype(str).str.strip().str.upper() + '|' +
-        df['title'].map(_canon_title)
-    )
+    df['__dedup_key'] = _dedup_key(df)
     before = len(df)
     df = df.drop_duplicates('__dedup_key', keep='first')
     df.drop(columns=['__dedup_key'], inplace=True)
@@ -495,67 +660,56 @@ def stage_build(year:int, infile:Path, outfile:Path):
     # exclusions (defensive)
     df = _apply_exclusions(df)
     # simple deduplication: date_local + title + country
-    import re as _re
-    def _canon_title(_s: str) -> str:
-        _s = str(_s or '').strip().lower()
-        _s = _s.replace('–','-').replace('—','-')
-        _s = _re.sub(r'\s+', ' ', _s)
-        _s = _re.sub(r'\s*([/-])\s*', r' \1 ', _s)
-        return _s.strip()
-    df['__dedup_key'] = (
-        df['date_local'].astype(str).str[:10] + '|' +
-        df['country'].astype(str).str.strip().str.upper() + '|' +
-        df['title'].map(_canon_title)
-    )
+    df['__dedup_key'] = _dedup_key(df)
     df = df.drop_duplicates('__dedup_key', keep='first').drop(columns='__dedup_key')
     # end dedup
     df.reset_index(drop=True, inplace=True)
-    rows = []
-    official_domains = get_official_domains()
-    for _, r in df.iterrows():
-        tz = str(r.get("tz","")).strip()
-        tz = canonicalize_tz(tz, cfg_dict)
-        dt_utc_iso = _to_utc_iso(str(r["date_local"]), str(r.get("time_local","") or ""), tz or None)
-        # Certainty/notes baseline
-        _cert = str(r.get("certainty",""))
-        _cert = _cert.strip().lower()
-        _notes = str(r.get("notes",""))
-        # TZ validity
-        _tz_ok = bool(tz)
-        if _tz_ok:
-            try:
-                ZoneInfo(tz)
-            except Exception:
-                _tz_ok = False
-        if not _tz_ok:
-            if _cert != 'estimated':
-                _cert = 'estimated'
-            if 'tz_fallback=utc' not in _notes.lower():
-                _notes = (_notes + ' | tz_fallback=utc').strip(' |')
-        # Domain-based promotion (official or gov-like) when tz is OK
-        host = _domain_from_url(r.get('source_url',''))
-        govlike_pats = get_govlike_patterns()
-        alias_domains = get_alias_domains()
-        canonical_map = get_canonical_host_map()
-        domain_officialish = _is_officialish_host(host, official_domains, govlike_pats, alias_domains, canonical_map)
-        if domain_officialish and _tz_ok and (_cert == '' or _cert == 'estimated') and str(r.get('time_local','')).strip()!='':
-            _cert = 'confirmed'
-        rows.append({
-            "datetime_utc": dt_utc_iso,
-            "event": r["title"],
-            "country": r["country"],
-            "impact": str(r["importance"]).strip().lower(),
-            "certainty": _cert,
-            "ticker": r.get("ticker",""),
-            "source_url": r.get("source_url",""),
-            "notes": _notes,
-        })
+    # Canonical tz per row (mapped over unique raw values, not per row)
+    tz_raw = df["tz"].astype(str).str.strip()
+    tz_map = {s: (canonicalize_tz(s, cfg_dict) or "") for s in tz_raw.unique()}
+    tz_col = tz_raw.map(tz_map)
+
+    # TZ validity per unique canonical name
+    tz_ok_map = {}
+    for t in set(tz_map.values()):
+        tz_ok_map[t] = _tz_ok(t)
+        if t and not tz_ok_map[t]:
+            print(f"[warn] invalid tz '{t}', fallback UTC", file=sys.stderr)
+    tz_ok = tz_col.map(tz_ok_map)
+
+    # UTC timestamps, batched per tz group
+    date_s = df["date_local"].astype(str).str.strip()
+    iso = _to_utc_iso_batch(date_s, df["time_local"], tz_col.where(tz_ok, 'UTC'))
+
+    # Certainty/notes baseline + tz fallback annotation
+    # (fillna('nan') keeps the scalar str(NaN) behavior byte-for-byte in outputs)
+    cert = df["certainty"].fillna('nan').astype(str).str.strip().str.lower()
+    notes = df["notes"].fillna('nan').astype(str)
+    bad_tz = ~tz_ok
+    cert = cert.mask(bad_tz, 'estimated')
+    need_note = bad_tz & ~notes.str.lower().str.contains('tz_fallback=utc', regex=False)
+    notes = notes.mask(need_note, (notes + ' | tz_fallback=utc').str.strip(' |'))
+
+    # Domain-based promotion (official or gov-like) when tz is OK
+    hosts = df["source_url"].astype(str).map(_domain_from_url)
+    officialish = hosts.map({h: _officialish_cached(h) for h in hosts.unique()})
+    promote = officialish & tz_ok & cert.isin(['', 'estimated']) & df["time_local"].astype(str).str.strip().ne('')
+    cert = cert.mask(promote, 'confirmed')
+
     cols = ["datetime_utc","event","country","impact","certainty","ticker","source_url","notes"]
-    out_df = pd.DataFrame(rows, columns=cols).sort_values(by=["datetime_utc","country","event"], kind="mergesort")
-    csv_bytes = out_df.to_csv(index=False).encode("utf-8")
+    out_df = pd.DataFrame({
+        "datetime_utc": iso,
+        "event": df["title"],
+        "country": df["country"],
+        "impact": df["importance"].astype(str).str.strip().str.lower(),
+        "certainty": cert,
+        "ticker": df["ticker"],
+        "source_url": df["source_url"],
+        "notes": notes,
+    }, columns=cols).sort_values(by=["datetime_utc","country","event"], kind="mergesort")
     with open(outfile, "wb") as raw:
         with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as gz:
-            gz.write(csv_bytes)
+            out_df.to_csv(gz, index=False, encoding="utf-8")
     return str(outfile)
 
 def stage_report(year:int, calendar_gz:Path, outfile:Path):
@@ -571,14 +725,19 @@ def stage_report(year:int, calendar_gz:Path, outfile:Path):
         df_me = None
     if 'datetime_utc' not in df.columns and 'dt_utc' in df.columns:
         df = df.rename(columns={'dt_utc':'datetime_utc'})
+    for c in ('country', 'impact'):
+        if c in df.columns:
+            df[c] = df[c].astype('category')
     total = len(df)
     lines = []
     lines.append(f"# Year Report — {year}\n")
     lines.append(f"_Generated at (UTC): {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}_\n")
     lines.append(f"- Total events: **{total}**\n")
     try:
-        tmin = pd.to_datetime(df['datetime_utc']).min()
-        tmax = pd.to_datetime(df['datetime_utc']).max()
+        # datetime_utc is uniform ISO-8601, so lexicographic min/max == chronological;
+        # only the two boundary values need parsing for display
+        tmin = pd.Timestamp(df['datetime_utc'].min())
+        tmax = pd.Timestamp(df['datetime_utc'].max())
         lines.append(f"- Date range (UTC): {tmin} → {tmax}\n")
     except Exception:
         pass
@@ -586,34 +745,33 @@ def stage_report(year:int, calendar_gz:Path, outfile:Path):
         lines.append(f"- Events by country: {df['country'].value_counts().to_dict()}\n")
     if "impact" in df.columns:
         lines.append(f"- Impact distribution: {df['impact'].value_counts().to_dict()}\n")
+    # Host per row as a categorical: classify each unique host once, gather by codes
+    urls = (df['source_url'] if 'source_url' in df.columns else pd.Series('', index=df.index)).fillna('').astype(str)
+    host_cat = urls.map({u: _domain_from_url(u) for u in urls.unique()}).astype('category')
+    hosts_uniq = host_cat.cat.categories
+    host_codes = host_cat.cat.codes.to_numpy()
+
     # Authenticity policy (union: official_domains ∪ gov_like_patterns; no bypass for 'confirmed')
-    official_domains = get_official_domains()
-    govlike_pats = get_govlike_patterns()
-    def _is_official_row(row):
-        cert = str(row.get('certainty','')).strip().lower()
-        if cert == 'secondary':
-            return False
-        host = _domain_from_url(row.get('source_url',''))
-        alias_domains = get_alias_domains()
-        canonical_map = get_canonical_host_map()
-        domain_official = _is_officialish_host(host, official_domains, govlike_pats, alias_domains, canonical_map)
-        return bool(domain_official)
-    authentic = int(df.apply(_is_official_row, axis=1).sum()) if total else 0
+    official_for_host = np.fromiter((_officialish_cached(h) for h in hosts_uniq), dtype=bool, count=len(hosts_uniq))
+    is_official = official_for_host[host_codes] if len(hosts_uniq) else np.zeros(len(df), dtype=bool)
+    cert_l = (df['certainty'] if 'certainty' in df.columns else pd.Series('', index=df.index)).fillna('').astype(str).str.strip().str.lower()
+    authentic = int((is_official & cert_l.ne('secondary').to_numpy()).sum()) if total else 0
     authenticity_pct = (authentic / total * 100) if total else 0.0
     lines.append(f"- Authenticity (official sources): **{authenticity_pct:.1f}%** ({authentic}/{total})\n")
 
     # Breakdown by source type: CB vs Statistical vs Other
     official_domains = get_official_domains()
-    gov_like = get_govlike_patterns()
-    def _src_bucket(row):
-        host = _domain_from_url(row.get('source_url',''))
+    gov_like = get_govlike_patterns_compiled()
+    def _src_bucket(host):
         if _is_officialish_host(host, None, gov_like):
             return 'CB'
         if _is_officialish_host(host, official_domains, []):
             return 'STAT'
         return 'OTHER'
     if not df.empty:
-        buckets = df.apply(_src_bucket, axis=1).value_counts(dropna=False).to_dict()
+        bucket_for_host = np.array([_src_bucket(h) for h in hosts_uniq])
+        vals, counts = np.unique(bucket_for_host[host_codes], return_counts=True)
+        buckets = dict(zip(vals.tolist(), counts.tolist()))
         total_b = int(len(df))
         cb = int(buckets.get('CB', 0))
         st = int(buckets.get('STAT', 0))
@@ -664,10 +822,7 @@ def update_state(year:int, calendar:Path, report:Path):
       This is robust to column reordering.
     - Includes a stable hash of config.yaml (if present).
     """
-    def sha256_bytes(b: bytes) -> str:
-        h = hashlib.sha256(); h.update(b); return h.hexdigest()
-
-    # Build per-year slice hash from parsed CSV
+    # Build per-year slice hash from parsed CSV (streamed through the hasher)
     year_slice_sha256 = ""
     try:
         manual = Path("manual_events.csv")
@@ -676,8 +831,10 @@ def update_state(year:int, calendar:Path, report:Path):
             df = _normalize_headers(df)
             if "date_local" in df.columns:
                 mask = df["date_local"].astype(str).str.startswith(f"{year}-")
-                yslice = df.loc[mask].to_csv(index=False).encode("utf-8")
-                year_slice_sha256 = sha256_bytes(yslice) if len(df.loc[mask]) else ""
+                if mask.any():
+                    sink = _HashWriter()
+                    df.loc[mask].to_csv(sink, index=False)
+                    year_slice_sha256 = sink.h.hexdigest()
     except Exception:
         year_slice_sha256 = ""
 
@@ -722,32 +879,49 @@ def write_manifest(year:int, files:list[Path]):
     return out
 
 # --- CLI ---
+@dataclass(slots=True)
+class RunCtx:
+    """Resolved run parameters shared by the cmd_* entry points."""
+    year: int
+    infile: Path
+    bundle: bool = False
+    force: bool = False
+
+    @classmethod
+    def from_args(cls, args) -> "RunCtx":
+        return cls(year=args.year,
+                   infile=Path(args.infile) if getattr(args, "infile", None) else Path("manual_events.csv"),
+                   bundle=getattr(args, "bundle", False),
+                   force=getattr(args, "force", False))
+
 def cmd_assemble(args):
     year = args.year
     providers = args.providers or ["fomc"]
     providers = (PROVIDERS_ALL if (len(providers)==1 and providers[0].lower()=="all") else providers)
     cache_dir = Path(args.cache_dir) if args.cache_dir else None
-    master = Path(args.infile) if args.infile else Path("manual_events.csv")
-    stage_collect(year, providers, master, cache_dir)
+    ctx = RunCtx.from_args(args)
+    stage_collect(year, providers, ctx.infile, cache_dir)
     if args.dry_run:
         print(f"[dry-run] year={year} providers={providers}")
         return
-    cmd_run(argparse.Namespace(year=year, infile=str(master), bundle=args.bundle, force=args.force))
+    _run(ctx)
 
 def cmd_run(args):
-    year = args.year
-    infile = Path(args.infile) if args.infile else Path("manual_events.csv")
-    if not infile.exists():
-        raise SystemExit(f"Input CSV not found: {infile}")
+    _run(RunCtx.from_args(args))
+
+def _run(ctx: RunCtx):
+    year = ctx.year
+    if not ctx.infile.exists():
+        raise SystemExit(f"Input CSV not found: {ctx.infile}")
     calendar = Path(f"calendar_{year}.csv.gz")
     report = Path(f"year_report_{year}.md")
-    stage_validate(year, infile)
-    stage_build(year, infile, calendar)
+    stage_validate(year, ctx.infile)
+    stage_build(year, ctx.infile, calendar)
     update_state(year, calendar, report)
     stage_report(year, calendar, report)
     write_manifest(year, [calendar, report, Path("state.json"), Path("config.yaml")])
-    if getattr(args, "bundle", False):
-        cmd_bundle(argparse.Namespace(year=year))
+    if ctx.bundle:
+        _bundle(year)
 
 def cmd_validate(args):
     infile = Path(args.infile) if args.infile else Path("manual_events.csv")
@@ -764,26 +938,24 @@ def cmd_report(args):
     stage_report(args.year, cal, out)
 
 def cmd_bundle(args):
-    year = args.year
+    _bundle(args.year)
+
+def _bundle(year: int):
     man = write_manifest(year, [Path(f"calendar_{year}.csv.gz"),
                                 Path(f"year_report_{year}.md"),
                                 Path("state.json"),
                                 Path("config.yaml")])
-    import io
-    mem = io.BytesIO()
-    with tarfile.open(fileobj=mem, mode="w") as tf:
-        def _repro(ti: tarfile.TarInfo):
-            ti.uid = 0; ti.gid = 0; ti.uname = ""; ti.gname = ""; ti.mtime = 0; ti.mode = 0o644
-            return ti
-        for name in [f"calendar_{year}.csv.gz", f"year_report_{year}.md", f"manifest_{year}.json", "state.json", "config.yaml"]:
-            p = Path(name)
-            if p.exists():
-                tf.add(p, arcname=p.name, filter=_repro)
-    mem.seek(0)
     bundle = Path(f"bundle_{year}.tar.gz")
     with open(bundle, "wb") as raw:
         with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as gz:
-            gz.write(mem.getvalue())
+            with tarfile.open(fileobj=gz, mode="w|") as tf:
+                def _repro(ti: tarfile.TarInfo):
+                    ti.uid = 0; ti.gid = 0; ti.uname = ""; ti.gname = ""; ti.mtime = 0; ti.mode = 0o644
+                    return ti
+                for name in [f"calendar_{year}.csv.gz", f"year_report_{year}.md", f"manifest_{year}.json", "state.json", "config.yaml"]:
+                    p = Path(name)
+                    if p.exists():
+                        tf.add(p, arcname=p.name, filter=_repro)
     print(bundle)
 
 def main():
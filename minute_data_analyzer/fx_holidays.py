@@ -3,11 +3,14 @@
 # Covers: New Year's Day (Jan 1), Good Friday (Easter - 2d), Christmas (Dec 25).
 # Optional (via policy): Boxing Day (Dec 26), Easter Monday (Easter + 1d).
 # Also supports extra closures from config as explicit UTC ranges.
-from datetime import datetime, timedelta, timezone
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 import re
 
 UTC = timezone.utc
 
+@lru_cache(maxsize=128)
 def _easter_date(year: int):
     # Anonymous Gregorian algorithm (Meeus/Jones/Butcher)
     a = year % 19
@@ -22,81 +25,89 @@ def _easter_date(year: int):
     k = c % 4
     l = (32 + 2*e + 2*i - h - k) % 7
     m = (a + 11*h + 22*l) // 451
-    month = (h + l - 7*m + 114) // 31
-    day = ((h + l - 7*m + 114) % 31) + 1
-    return datetime(year, month, day, tzinfo=UTC).date()
+    n = h + l - 7*m + 114
+    return date(year, n // 31, (n % 31) + 1)
 
 def _full_day_utc(dateobj):
     start = datetime(dateobj.year, dateobj.month, dateobj.day, 0, 0, tzinfo=UTC)
     end   = start + timedelta(days=1)
     return (start, end)
 
-def _parse_extra_windows(cfg_text: str):
-    # Parse extra closures from config in format: "YYYY-MM-DDTHH:MM:SSZ -> YYYY-MM-DDTHH:MM:SSZ"
-    wins = []
+# Config-scanner regexes, compiled once
+_RE_SCORING  = re.compile(r'^\s*scoring\s*:\s*$')
+_RE_TOPLEVEL = re.compile(r'^\S')
+_RE_IGNORE   = re.compile(r'^\s*ignore\s*:\s*$')
+_RE_FX       = re.compile(r'^\s*fx_holiday_policy\s*:\s*$')
+_RE_EXTRA    = re.compile(r'^\s*extra_closures_utc\s*:\s*$')
+_RE_MODE     = re.compile(r'^\s*mode\s*:\s*(\w+)\s*$')
+_RE_INCLUDE  = re.compile(r'^\s*include\s*:\s*\[(.*)\]\s*$')
+_RE_EXTENDED = re.compile(r'^\s*extended\s*:\s*(true|false)\s*$', re.I)
+_RE_WINDOW_LINE = re.compile(r'^\s*-\s*"([^"]+)"\s*$')
+
+def _parse_iso_z(x: str):
+    # C-level fromisoformat instead of regex + int slicing ('Z' spelled as +00:00
+    # so this also works on Python < 3.11)
+    if not x.endswith('Z'):
+        return None
+    try:
+        return datetime.fromisoformat(x[:-1] + '+00:00')
+    except ValueError:
+        return None
+
+def _parse_cfg(cfg_text: str):
+    # One pass over the YAML-ish config: policy flags + extra closure windows.
+    # Extra closures use the format: "YYYY-MM-DDTHH:MM:SSZ -> YYYY-MM-DDTHH:MM:SSZ"
+    mode = "minimal"
+    include = set()
+    extended = False
+    extra = []
     if not cfg_text:
-        return wins
-    in_scoring = False
-    in_ignore = False
-    in_fx = False
+        return mode, include, extended, extra
+    in_scoring = False; in_ignore = False; in_fx = False
     for ln in cfg_text.splitlines():
-        if re.match(r'^\s*scoring\s*:\s*$', ln):
+        if _RE_SCORING.match(ln):
             in_scoring = True; in_ignore = False; in_fx = False; continue
-        if in_scoring and re.match(r'^\S', ln):
+        if in_scoring and _RE_TOPLEVEL.match(ln):
             in_scoring = False
-        if in_scoring and re.match(r'^\s*ignore\s*:\s*$', ln):
+        if in_scoring and _RE_IGNORE.match(ln):
             in_ignore = True; in_fx = False; continue
-        if in_ignore and re.match(r'^\s*fx_holiday_policy\s*:\s*$', ln):
+        if in_ignore and _RE_FX.match(ln):
             in_fx = True; continue
-        if in_fx and re.match(r'^\s*extra_closures_utc\s*:\s*$', ln):
+        if not in_fx:
+            continue
+        m = _RE_MODE.match(ln)
+        if m:
+            mode = m.group(1).lower(); continue
+        m = _RE_INCLUDE.match(ln)
+        if m:
+            include.update(x.strip() for x in m.group(1).split(",") if x.strip()); continue
+        m = _RE_EXTENDED.match(ln)
+        if m:
+            extended = (m.group(1).lower() == "true"); continue
+        if _RE_EXTRA.match(ln):
             continue
-        if in_fx:
-            m = re.match(r'^\s*-\s*"([^"]+)"\s*$', ln)
-            if m:
-                s = m.group(1)
-                parts = [p.strip() for p in s.split("->")]
-                if len(parts) == 2:
-                    def parse_iso_z(x):
-                        m2 = re.match(r'^(\d{4}-\d{2}-\d{2})T(\d{2}):(\d{2}):(\d{2})Z$', x)
-                        if not m2: return None
-                        y, mo, d, hh, mm, ss = map(int, (m2.group(1)[0:4], m2.group(1)[5:7], m2.group(1)[8:10], m2.group(2), m2.group(3), m2.group(4)))
-                        return datetime(y, mo, d, hh, mm, ss, tzinfo=UTC)
-                    st = parse_iso_z(parts[0]); en = parse_iso_z(parts[1])
-                    if st and en and en > st:
-                        wins.append((st, en))
-    return wins
+        m = _RE_WINDOW_LINE.match(ln)
+        if m:
+            parts = [p.strip() for p in m.group(1).split("->")]
+            if len(parts) == 2:
+                st = _parse_iso_z(parts[0]); en = _parse_iso_z(parts[1])
+                if st and en and en > st:
+                    extra.append((st, en))
+    return mode, include, extended, extra
 
-def fx_holiday_windows(year: int, cfg_text: str):
-    # Read policy flags from cfg_text
-    mode = "minimal"
-    include = set()
-    extended = False
-    if cfg_text:
-        in_scoring = False; in_ignore = False; in_fx = False
-        for ln in cfg_text.splitlines():
-            if re.match(r'^\s*scoring\s*:\s*$', ln):
-                in_scoring = True; in_ignore = False; in_fx = False; continue
-            if in_scoring and re.match(r'^\S', ln):
-                in_scoring = False
-            if in_scoring and re.match(r'^\s*ignore\s*:\s*$', ln):
-                in_ignore = True; in_fx = False; continue
-            if in_ignore and re.match(r'^\s*fx_holiday_policy\s*:\s*$', ln):
-                in_fx = True; continue
-            if in_fx:
-                m = re.match(r'^\s*mode\s*:\s*(\w+)\s*$', ln)
-                if m:
-                    mode = m.group(1).lower()
-                m2 = re.match(r'^\s*include\s*:\s*\[(.*)\]\s*$', ln)
-                if m2:
-                    items = [x.strip() for x in m2.group(1).split(",") if x.strip()]
-                    include.update(items)
-                m3 = re.match(r'^\s*extended\s*:\s*(true|false)\s*$', ln, flags=re.I)
-                if m3:
-                    extended = (m3.group(1).lower() == "true")
+@lru_cache(maxsize=8)
+def _parse_cfg_cached(cfg_text):
+    # Hashable form of _parse_cfg output, keyed on the raw config text.
+    mode, include, extended, extra = _parse_cfg(cfg_text or "")
+    return mode, frozenset(include), extended, tuple(extra)
+
+_MINIMAL_INCLUDE = frozenset({"christmas", "new_year", "good_friday"})
+_EXTENDED_INCLUDE = _MINIMAL_INCLUDE | {"boxing_day", "easter_monday"}
+
+@lru_cache(maxsize=64)
+def _windows_for_year(year: int, mode: str, include: frozenset, extended: bool, extra: tuple):
     if not include:
-        include = {"christmas", "new_year", "good_friday"}
-        if mode == "extended" or extended:
-            include |= {"boxing_day", "easter_monday"}
+        include = _EXTENDED_INCLUDE if (mode == "extended" or extended) else _MINIMAL_INCLUDE
 
     wins = []
     easter = _easter_date(year)
@@ -111,11 +122,74 @@ def fx_holiday_windows(year: int, cfg_text: str):
     if "boxing_day" in include:
         wins.append(_full_day_utc(datetime(year, 12, 26, tzinfo=UTC).date()))
 
-    wins.extend(_parse_extra_windows(cfg_text))
-    return wins
+    wins.extend(extra)
+    return tuple(wins)
+
+_DEFAULT_POLICY = ("minimal", frozenset(), False, ())
+
+def fx_holiday_windows(year: int, cfg_text: str):
+    if not cfg_text:
+        return list(_windows_for_year(year, *_DEFAULT_POLICY))
+    return list(_windows_for_year(year, *_parse_cfg_cached(cfg_text)))
+
+@lru_cache(maxsize=64)
+def _windows_ns_for_year(year: int, mode: str, include: frozenset, extended: bool, extra: tuple):
+    return tuple((_dt_to_ns(s), _dt_to_ns(e))
+                 for s, e in _windows_for_year(year, mode, include, extended, extra))
+
+def fx_holiday_windows_ns(year: int, cfg_text: str):
+    # Same windows as fx_holiday_windows, as (start_ns, end_ns) int64 UTC pairs
+    # for callers working with epoch-nanosecond timestamps (e.g. DatetimeIndex.asi8).
+    if not cfg_text:
+        return list(_windows_ns_for_year(year, *_DEFAULT_POLICY))
+    return list(_windows_ns_for_year(year, *_parse_cfg_cached(cfg_text)))
+
+def in_any_window_ns(ts_ns, windows_ns):
+    for (s, e) in windows_ns:
+        if s <= ts_ns < e:
+            return True
+    return False
 
 def in_any_window(ts, windows):
     for (s, e) in windows:
         if s <= ts < e:
             return True
     return False
+
+def build_window_index(windows):
+    # Sort by start and keep a running max of ends so overlapping windows
+    # still answer "covered by any window" from a single bisect probe.
+    wins = sorted(windows)
+    starts = [s for s, _ in wins]
+    ends_runmax = []
+    m = None
+    for _, e in wins:
+        m = e if (m is None or e > m) else m
+        ends_runmax.append(m)
+    return starts, ends_runmax
+
+def in_any_window_idx(ts, idx):
+    # O(log W) variant of in_any_window for an index from build_window_index().
+    starts, ends_runmax = idx
+    i = bisect_right(starts, ts) - 1
+    return i >= 0 and ts < ends_runmax[i]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+def _dt_to_ns(dt):
+    td = dt - _EPOCH
+    return (td.days * 86400 + td.seconds) * 1_000_000_000 + td.microseconds * 1000
+
+def mask_in_any_window(ts_ns, windows):
+    # Vectorized in_any_window: ts_ns is an int64 array of UTC nanoseconds
+    # (e.g. DatetimeIndex.asi8); returns a boolean mask.
+    import numpy as np
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    if len(windows) == 0:
+        return np.zeros(ts_ns.shape, dtype=bool)
+    starts = np.fromiter((_dt_to_ns(s) for s, _ in windows), dtype=np.int64, count=len(windows))
+    ends = np.fromiter((_dt_to_ns(e) for _, e in windows), dtype=np.int64, count=len(windows))
+    order = np.argsort(starts, kind='stable')
+    ends_runmax = np.maximum.accumulate(ends[order])
+    i = np.searchsorted(starts[order], ts_ns, side='right') - 1
+    return (i >= 0) & (ts_ns < ends_runmax[np.maximum(i, 0)])
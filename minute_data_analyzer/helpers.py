@@ -1,10 +1,21 @@
 # Patched helpers.py with strict template rendering and deterministic tar.gz
 from __future__ import annotations
 from typing import Dict, List
-import io, gzip, tarfile
+import calendar
+import datetime
+import io, gzip, os, re, tarfile
 
-def write_gzip_deterministic(data: bytes, compresslevel: int = 9) -> bytes:
+def _gzip_level() -> int:
+    """Default gzip compresslevel (6: near level-9 ratio, much faster). Override with EM_GZIP_LEVEL."""
+    try:
+        return int(os.environ.get("EM_GZIP_LEVEL", 6))
+    except ValueError:
+        return 6
+
+def write_gzip_deterministic(data: bytes, compresslevel: int = None) -> bytes:
     """Return gzip bytes with mtime=0 for reproducible hashes."""
+    if compresslevel is None:
+        compresslevel = _gzip_level()
     buf = io.BytesIO()
     with gzip.GzipFile(filename="", mode="wb", fileobj=buf, compresslevel=compresslevel, mtime=0) as gz:
         gz.write(data)
@@ -13,88 +24,109 @@ def write_gzip_deterministic(data: bytes, compresslevel: int = 9) -> bytes:
 def make_tar_gz_deterministic(base_dir: str, paths: List[str], dst_path: str,
                               mtime: int = 0, uid: int = 0, gid: int = 0,
                               uname: str = "root", gname: str = "root",
-                              mode: int = 0o644, compresslevel: int = 9) -> None:
+                              mode: int = 0o644, compresslevel: int = None) -> None:
     """Pack files into tar.gz deterministically (fixed metadata + gzip mtime=0)."""
-    import os
-    buf = io.BytesIO()
-    with tarfile.open(mode="w", fileobj=buf, format=tarfile.GNU_FORMAT) as tar:
-        for rel in sorted(paths):
-            full = os.path.join(base_dir, rel)
-            ti = tar.gettarinfo(full, arcname=rel)
-            ti.mtime = mtime
-            ti.uid = uid
-            ti.gid = gid
-            ti.uname = uname
-            ti.gname = gname
-            ti.mode = mode
-            with open(full, "rb") as rf:
-                tar.addfile(ti, rf)
-    gz_bytes = write_gzip_deterministic(buf.getvalue(), compresslevel=compresslevel)
+    if compresslevel is None:
+        compresslevel = _gzip_level()
     with open(dst_path, "wb") as f:
-        f.write(gz_bytes)
+        with gzip.GzipFile(filename="", mode="wb", fileobj=f, compresslevel=compresslevel, mtime=0) as gz:
+            with tarfile.open(mode="w|", fileobj=gz, format=tarfile.GNU_FORMAT) as tar:
+                tar.copybufsize = 1024 * 1024  # fewer read/write round-trips into zlib for large members
+                for rel in sorted(paths):
+                    full = os.path.join(base_dir, rel)
+                    ti = tar.gettarinfo(full, arcname=rel)
+                    ti.mtime = mtime
+                    ti.uid = uid
+                    ti.gid = gid
+                    ti.uname = uname
+                    ti.gname = gname
+                    ti.mode = mode
+                    with open(full, "rb") as rf:
+                        tar.addfile(ti, rf)
+
+def _render_template_bytes(data: bytes, context: Dict[str, str]) -> bytes:
+    """Replace every known {{key}} in one linear scan; unknown placeholders pass through.
+
+    Works on raw UTF-8 bytes: the {{...}} delimiters are ASCII and cannot occur
+    inside a multibyte sequence, so no decode/encode round-trip is needed.
+    """
+    if not context:
+        return data
+    repl = {k.encode("utf-8"): str(v).encode("utf-8") for k, v in context.items()}
+    pattern = re.compile(rb"\{\{(" + b"|".join(map(re.escape, repl)) + rb")\}\}")
+    return pattern.sub(lambda m: repl[m.group(1)], data)
 
 def render_template_file(template_path: str, output_path: str, context: Dict[str, str]) -> None:
     """Simple {{key}} replacement for Markdown templates."""
-    with open(template_path, "r", encoding="utf-8") as f:
-        txt = f.read()
-    for k, v in context.items():
-        txt = txt.replace("{{"+k+"}}", str(v))
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(txt)
+    with open(template_path, "rb") as f:
+        data = f.read()
+    data = _render_template_bytes(data, context)
+    with open(output_path, "wb") as f:
+        f.write(data)
+
+_LEFTOVER_RE = re.compile(rb"\{\{[^}]+\}\}")
 
 def render_template_file_strict(template_path: str, output_path: str, context: Dict[str, str]) -> None:
     """Same as render_template_file, but asserts there are no unresolved {{...}} placeholders."""
-    render_template_file(template_path, output_path, context)
-    import re
-    with open(output_path, "r", encoding="utf-8") as f:
-        out = f.read()
-    leftovers = re.findall(r"\{\{[^}]+\}\}", out)
+    with open(template_path, "rb") as f:
+        data = f.read()
+    out = _render_template_bytes(data, context)
+    leftovers = _LEFTOVER_RE.findall(out)
     if leftovers:
-        raise ValueError(f"Unresolved placeholders in {output_path}: {sorted(set(leftovers))}")
+        leftovers = sorted({x.decode("utf-8", "replace") for x in leftovers})
+        raise ValueError(f"Unresolved placeholders in {output_path}: {leftovers}")
+    with open(output_path, "wb") as f:
+        f.write(out)
 
 
-def save_svg_deterministic(fig, path: str) -> None:
-    """Save Matplotlib figure to SVG with deterministic settings."""
+_DET_SVG_READY = False
+
+def _ensure_det_svg() -> None:
+    # Deterministic SVG settings; applied once per process. The matplotlib
+    # import stays local so non-plotting callers never pay for it.
+    global _DET_SVG_READY
+    if _DET_SVG_READY:
+        return
     import matplotlib
-    # Deterministic SVG settings
     matplotlib.rcParams['svg.hashsalt'] = ''
     matplotlib.rcParams['svg.fonttype'] = 'none'
     matplotlib.rcParams['path.simplify'] = False
+    _DET_SVG_READY = True
+
+def save_svg_deterministic(fig, path: str) -> None:
+    """Save Matplotlib figure to SVG with deterministic settings."""
+    _ensure_det_svg()
     fig.savefig(path, format='svg')
 
 def write_svgz_deterministic(svg_bytes: bytes, dst_path: str) -> None:
     """Write .svgz with gzip mtime=0 for reproducible hash."""
-    buf = io.BytesIO()
-    with gzip.GzipFile(filename="", mode="wb", fileobj=buf, compresslevel=9, mtime=0) as gz:
-        gz.write(svg_bytes)
     with open(dst_path, "wb") as f:
-        f.write(buf.getvalue())
+        with gzip.GzipFile(filename="", mode="wb", fileobj=f, compresslevel=_gzip_level(), mtime=0) as gz:
+            gz.write(svg_bytes)
 
 
 # --- Time window helpers (UTC) for deterministic slicing ---
 def quarter_bounds(year: int, q: int):
     """Return (start_utc, end_utc) for quarter q in year, as ISO8601 strings."""
-    import datetime as _dt, pytz as _tz
     if q not in (1,2,3,4):
         raise ValueError("q must be 1..4")
     start_month = 3*(q-1) + 1
     end_year = year + (1 if q==4 else 0)
     end_month = 1 if q==4 else start_month + 3
-    tz = _tz.UTC
-    start = _dt.datetime(year, start_month, 1, 0, 0, 0, tzinfo=tz)
-    end = _dt.datetime(end_year, end_month, 1, 0, 0, 0, tzinfo=tz)
+    tz = datetime.timezone.utc
+    start = datetime.datetime(year, start_month, 1, 0, 0, 0, tzinfo=tz)
+    end = datetime.datetime(end_year, end_month, 1, 0, 0, 0, tzinfo=tz)
     return start, end
 
 def month_bounds(year: int, month: int):
     """Return (start_utc, end_utc) for month in year, as ISO8601 strings."""
-    import datetime as _dt, pytz as _tz, calendar as _cal
     if not (1 <= month <= 12):
         raise ValueError("month must be 1..12")
-    tz = _tz.UTC
-    last_day = _cal.monthrange(year, month)[1]
-    start = _dt.datetime(year, month, 1, 0, 0, 0, tzinfo=tz)
+    tz = datetime.timezone.utc
+    last_day = calendar.monthrange(year, month)[1]
+    start = datetime.datetime(year, month, 1, 0, 0, 0, tzinfo=tz)
     if month == 12:
-        end = _dt.datetime(year+1, 1, 1, 0, 0, 0, tzinfo=tz)
+        end = datetime.datetime(year+1, 1, 1, 0, 0, 0, tzinfo=tz)
     else:
-        end = _dt.datetime(year, month+1, 1, 0, 0, 0, tzinfo=tz)
+        end = datetime.datetime(year, month+1, 1, 0, 0, 0, tzinfo=tz)
     return start, end
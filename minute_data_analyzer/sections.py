@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 import re
 import numpy as np
 import pandas as pd
 import fx_holidays
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 
@@ -12,44 +13,67 @@ def _load_calendar_df(year: int) -> pd.DataFrame | None:
     """
     Load calendar_YEAR.csv with columns: datetime_utc, event, impact/importance (case-insensitive).
     Returns DataFrame tz-aware UTC or None if file is missing/empty.
+    Parsed frames are cached per (path, mtime), so repeated monthly/quarterly
+    builds don't re-read the CSV.
     """
     path_opts = [Path(f"calendar_{year}.csv"), Path("/mnt/data")/f"calendar_{year}.csv"]
     for p in path_opts:
         if p.exists():
             try:
-                df = pd.read_csv(p)
-                # normalize columns
-                cols = {c.lower(): c for c in df.columns}
-                if 'datetime_utc' not in cols and 'datetime' in cols:
-                    df.rename(columns={cols['datetime']: 'datetime_utc'}, inplace=True)
-                if 'datetime_utc' not in df.columns:
-                    # try parse from first column
-                    df.columns = [str(c) for c in df.columns]
-                    key = list(df.columns)[0]
-                    df.rename(columns={key: 'datetime_utc'}, inplace=True)
-                # event/impact aliases
-                if 'impact' not in df.columns and 'importance' in df.columns:
-                    df.rename(columns={'importance': 'impact'}, inplace=True)
-                if 'event' not in df.columns:
-                    df['event'] = ''
-                # parse ts in UTC
-                ts = pd.to_datetime(df['datetime_utc'], utc=True, errors='coerce')
-                df = df.loc[ts.notna()].copy()
-                df['datetime_utc'] = ts.dt.tz_convert('UTC')
-                # keep only High-impact
-                def _is_high(x):
-                    s = str(x).strip().lower()
-                    return s in ('high','3','high impact','very-high','high (usd)','high (us)') or 'high' in s
-                if 'impact' in df.columns:
-                    df = df.loc[df['impact'].apply(_is_high)]
-                # sort & unique per timestamp
-                df = df.sort_values('datetime_utc').drop_duplicates(subset=['datetime_utc'])
-                df = df[['datetime_utc','event'] + ([c for c in df.columns if c not in ('datetime_utc','event')])]
-                return df.reset_index(drop=True)
+                return _load_calendar_df_cached(str(p), p.stat().st_mtime_ns)
             except Exception:
                 return None
     return None
 
+@lru_cache(maxsize=8)
+def _load_calendar_df_cached(path_str: str, mtime_ns: int) -> pd.DataFrame | None:
+    try:
+        df = pd.read_csv(path_str)
+        # normalize columns
+        cols = {c.lower(): c for c in df.columns}
+        if 'datetime_utc' not in cols and 'datetime' in cols:
+            df.rename(columns={cols['datetime']: 'datetime_utc'}, inplace=True)
+        if 'datetime_utc' not in df.columns:
+            # try parse from first column
+            df.columns = [str(c) for c in df.columns]
+            key = list(df.columns)[0]
+            df.rename(columns={key: 'datetime_utc'}, inplace=True)
+        # event/impact aliases
+        if 'impact' not in df.columns and 'importance' in df.columns:
+            df.rename(columns={'importance': 'impact'}, inplace=True)
+        if 'event' not in df.columns:
+            df['event'] = ''
+        # parse ts in UTC: try the ISO8601 fast path first (no per-value
+        # format inference); fall back to inference for non-ISO sources
+        # or pandas < 2.0
+        try:
+            ts = pd.to_datetime(df['datetime_utc'], format='ISO8601', utc=True)
+        except (TypeError, ValueError):
+            ts = pd.to_datetime(df['datetime_utc'], utc=True, errors='coerce', cache=True)
+        df = df.loc[ts.notna()].copy()
+        df['datetime_utc'] = ts.dt.tz_convert('UTC')
+        # keep only High-impact (vectorized string ops; same accepted spellings)
+        if 'impact' in df.columns:
+            s = df['impact'].astype(str).str.strip().str.lower()
+            df = df.loc[s.isin(('high','3','very-high')) | s.str.contains('high', na=False)]
+        # sort & unique per timestamp
+        df = df.sort_values('datetime_utc').drop_duplicates(subset=['datetime_utc'])
+        df = df[['datetime_utc','event'] + ([c for c in df.columns if c not in ('datetime_utc','event')])]
+        return df.reset_index(drop=True)
+    except Exception:
+        return None
+
+def _dt_i8(values) -> np.ndarray:
+    """Datetime-like values -> int64 epoch nanoseconds (resolution-normalized)."""
+    idx = pd.DatetimeIndex(values)
+    if hasattr(idx, "as_unit"):  # pandas >= 2 may store s/ms/us resolutions
+        idx = idx.as_unit("ns")
+    return idx.asi8
+
+def _month_i8(values) -> np.ndarray:
+    """Datetime-like values -> int64 month index (months since 1970-01)."""
+    return _dt_i8(values).view("datetime64[ns]").astype("datetime64[M]").view("i8")
+
 def _match_calendar_high(tagged: pd.DataFrame, cal_df: pd.DataFrame | None, window_sec: int = 60) -> tuple[pd.DataFrame, dict]:
     """
     For each gap, mark calendar_high=True if any High-impact event falls into [gap_start - w, gap_end + w].
@@ -60,31 +84,33 @@ def _match_calendar_high(tagged: pd.DataFrame, cal_df: pd.DataFrame | None, wind
     """
     if cal_df is None or len(cal_df) == 0 or tagged is None or len(tagged) == 0:
         t = 0 if cal_df is None else len(cal_df)
-        out = tagged.copy()
-        out['calendar_high'] = False
+        out = tagged.assign(calendar_high=False)
         return out, {'total_high_events': t, 'matched_high_events': 0, 'coverage': 0.0}
 
-    w = pd.to_timedelta(window_sec, unit='s')
-    out = tagged.copy()
-    out['calendar_high'] = False
-
-    # Work on anomalies subset for coverage, but mark column for all gaps
-    anomalies_idx = out.index[out['reason'].isna()]
-    matched_events = set()
-
-    # Vectorized-ish sweep: for each event, mark overlaps
-    # (len(cal_df) is small typically, loop is ok; ensures determinism with sorted timestamps)
-    for ts in cal_df['datetime_utc'].sort_values():
-        # mask gaps where ts in [start-w, end+w]
-        m = (out['gap_start'] - w <= ts) & (ts <= out['gap_end'] + w)
-        if m.any():
-            out.loc[m, 'calendar_high'] = True
-            # if any anomaly matches, count event into coverage
-            if m.loc[anomalies_idx].any():
-                matched_events.add(ts)
+    # Interval stabbing on int64-ns arrays: a gap is hit when any event falls
+    # into [gap_start - w, gap_end + w]; an event counts toward coverage when
+    # it stabs any anomaly gap (reason isna).
+    w_ns = int(window_sec) * 1_000_000_000
+    starts = _dt_i8(tagged['gap_start']) - w_ns
+    ends = _dt_i8(tagged['gap_end']) + w_ns
+    ev = np.sort(_dt_i8(cal_df['datetime_utc']))
+
+    # assign() shares the existing columns and only materializes the new one
+    out = tagged.assign(calendar_high=np.searchsorted(ev, ends, side='right') > np.searchsorted(ev, starts, side='left'))
+
+    matched_high = 0
+    anom = tagged['reason'].isna().to_numpy()
+    if anom.any():
+        # Sort anomaly intervals by start and keep a running max of ends so
+        # overlapping gaps still answer a stab query from one searchsorted.
+        order = np.argsort(starts[anom], kind='stable')
+        a_starts = starts[anom][order]
+        a_ends_runmax = np.maximum.accumulate(ends[anom][order])
+        pos = np.searchsorted(a_starts, ev, side='right') - 1
+        m_ev = (pos >= 0) & (ev <= a_ends_runmax[np.maximum(pos, 0)])
+        matched_high = int(np.unique(ev[m_ev]).size)
 
     total_high = int(len(cal_df))
-    matched_high = int(len(matched_events))
     coverage = (matched_high / total_high) if total_high > 0 else 0.0
 
     return out, {'total_high_events': total_high, 'matched_high_events': matched_high, 'coverage': float(coverage)}
@@ -92,9 +118,26 @@ def _match_calendar_high(tagged: pd.DataFrame, cal_df: pd.DataFrame | None, wind
 
 
 # ===================== TZ handling (source -> UTC) =====================
-
+# Config-scanner regexes, compiled once
+_RE_SOURCE_TZ = re.compile(r"(?m)^\s*source_tz\s*:\s*([^#\n]+)")
+_RE_TZ_VAL = re.compile(r"^(?:UTC)?([+-]?)(\d{1,2})(?::?(\d{2}))?$")
+_RE_FORCE = re.compile(r'(?m)^\s*force_shift_even_if_utc\s*:\s*([^#\n]+)')
+_RE_RUNTIME = re.compile(r'^\s*runtime\s*:\s*$')
+_RE_TF = re.compile(r'^\s*timeframe\s*:\s*([A-Za-z0-9]+)\s*$')
+_RE_TOPLEVEL = re.compile(r'^\S')
+_RE_WEEKLY = re.compile(r'(?m)^\s*weekly_window_utc\s*:\s*"([^"]+)"')
+_RE_DATES_BLOCK = re.compile(r'(?ms)^\s*dates_utc\s*:\s*(\n(?:\s*-\s*\[[^]]+\]\s*\n?)+)')
+_RE_DATE_ITEM = re.compile(r'-\s*\[\s*"([^"]+)"\s*,\s*"([^"]+)"\s*\]')
+_RE_POLICY_BLOCK = re.compile(r'(?ms)^\s*fx_holiday_policy\s*:\s*(\n(?:\s+.+\n?)*)')
+_RE_POLICY_MODE = re.compile(r'(?m)^\s*mode\s*:\s*(\w+)\s*$')
+_RE_POLICY_INCLUDE = re.compile(r'(?m)^\s*include\s*:\s*\[(.*)\]\s*$')
+_RE_POLICY_EXTENDED = re.compile(r'(?m)^\s*extended\s*:\s*(true|false)\s*$', re.I)
+_RE_WDHM = re.compile(r'^(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s+(\d{1,2}):(\d{2})$')
+
+
+@lru_cache(maxsize=8)
 def _parse_source_tz_offset_minutes(cfg_text: str) -> int:
-    m = re.search(r"(?m)^\s*source_tz\s*:\s*([^#\n]+)", cfg_text or "")
+    m = _RE_SOURCE_TZ.search(cfg_text or "")
     if not m:
         return 0
     val = m.group(1).strip().strip('"\'').upper()
@@ -102,7 +145,7 @@ def _parse_source_tz_offset_minutes(cfg_text: str) -> int:
         return 0
     if val in ("EST_FIXED","EST","UTC-5","-5","+(-5)"):
         return -300
-    mm = re.match(r"^(?:UTC)?([+-]?)(\d{1,2})(?::?(\d{2}))?$", val)
+    mm = _RE_TZ_VAL.match(val)
     if mm:
         sign = -1 if mm.group(1) == '-' else 1
         hh = int(mm.group(2)); mn = int(mm.group(3) or 0)
@@ -120,7 +163,7 @@ def _coerce_input_utc(df: pd.DataFrame, cfg_text: str) -> pd.DataFrame:
         offset_min = _parse_source_tz_offset_minutes(cfg_text)
     except Exception:
         offset_min = 0
-    m_force = re.search(r'(?m)^\s*force_shift_even_if_utc\s*:\s*([^#\n]+)', cfg_text or '')
+    m_force = _RE_FORCE.search(cfg_text or '')
     force_flag = False
     if m_force:
         val = m_force.group(1).strip().strip('\"\'')
@@ -134,114 +177,129 @@ def _coerce_input_utc(df: pd.DataFrame, cfg_text: str) -> pd.DataFrame:
     # Case A: tz-naive -> interpret as source_tz and shift to UTC
     if getattr(ser.dt, 'tz', None) is None or force_flag:
         ser_naive = ser.dt.tz_localize(None) if getattr(ser.dt, 'tz', None) is not None else ser
-        df = df.copy(); df['datetime_utc'] = _shift_naive_to_utc(ser_naive); return df
+        return df.assign(datetime_utc=_shift_naive_to_utc(ser_naive))
     # Case B: tz-aware non-UTC -> convert to UTC
     try:
         if str(ser.dt.tz) != 'UTC':
-            df = df.copy(); df['datetime_utc'] = ser.dt.tz_convert('UTC')
+            df = df.assign(datetime_utc=ser.dt.tz_convert('UTC'))
     except Exception:
         pass
     return df
 
 # ===================== Runtime timeframe & bars =====================
 
+@lru_cache(maxsize=8)
+def _read_text_cached(path_str: str, mtime_ns: int) -> str:
+    return Path(path_str).read_text(encoding="utf-8")
+
 def _read_config_text() -> str:
-    try:
-        return Path("project_config.yml").read_text(encoding="utf-8")
-    except Exception:
+    for p in (Path("project_config.yml"), Path("/mnt/data/project_config.yml")):
         try:
-            return Path("/mnt/data/project_config.yml").read_text(encoding="utf-8")
+            return _read_text_cached(str(p), p.stat().st_mtime_ns)
         except Exception:
-            return ""
+            continue
+    return ""
 
+@lru_cache(maxsize=8)
 def _read_runtime_timeframe(cfg_text: str) -> str:
     tf = None
     lines = cfg_text.splitlines()
     in_runtime = False
     for ln in lines:
-        if re.match(r'^\s*runtime\s*:\s*$', ln):
+        if _RE_RUNTIME.match(ln):
             in_runtime = True
             continue
         if in_runtime:
-            m = re.match(r'^\s*timeframe\s*:\s*([A-Za-z0-9]+)\s*$', ln)
+            m = _RE_TF.match(ln)
             if m:
                 tf = m.group(1).upper()
                 break
-        if re.match(r'^\S', ln):
+        if _RE_TOPLEVEL.match(ln):
             in_runtime = False
     return tf if tf in ("M1","M5","H1") else "M5"
 
+_TF_RULE = {"M5": "5T", "H1": "H"}
+
 def _resample_ohlcv(df: pd.DataFrame, tf: str) -> pd.DataFrame:
     if tf == "M1":
         return df.copy()
-    rule = {"M5": "5T", "H1": "H"}[tf]
-    dfr = (df.set_index("datetime_utc")
-             .resample(rule, label="right", closed="right")
-             .agg({"open":"first","high":"max","low":"min","close":"last","volume":"sum"}))
-    dfr = dfr.dropna(subset=["open","high","low","close"]).reset_index()
-    return dfr
+    # label='right'/closed='right' bins are exactly "ceil to the grid", so a
+    # groupby on the ceiled timestamps yields the same bars while never
+    # materializing the empty bins resample would emit for sparse stretches.
+    key = df["datetime_utc"].dt.ceil(_TF_RULE[tf])
+    return (df.groupby(key)
+              .agg(open=("open", "first"), high=("high", "max"), low=("low", "min"),
+                   close=("close", "last"), volume=("volume", "sum"))
+              .reset_index())
 
 def _bar_gaps(bars: pd.DataFrame, tf: str) -> pd.DataFrame:
     if bars.empty:
         return pd.DataFrame(columns=["gap_start","gap_end","delta_sec"])
     expect = {"M1": 60, "M5": 300, "H1": 3600}[tf]
-    dsec = bars["datetime_utc"].diff().dt.total_seconds().fillna(expect).astype(int)
-    idx = dsec[dsec > expect].index
-    rows = []
-    for i in idx:
-        s = bars.loc[i-1, "datetime_utc"]; e = bars.loc[i, "datetime_utc"]
-        rows.append({"gap_start": s, "gap_end": e, "delta_sec": int((e-s).total_seconds())})
-    return pd.DataFrame(rows)
+    ts = pd.DatetimeIndex(bars["datetime_utc"])
+    dsec = np.diff(_dt_i8(ts)) // 1_000_000_000
+    i = np.flatnonzero(dsec > expect)
+    return pd.DataFrame({"gap_start": ts[i], "gap_end": ts[i+1],
+                         "delta_sec": dsec[i].astype(int)})
 
 # ===================== Explainable windows (UTC) =====================
 
-def _overlaps_any(s, e, wins: List[Tuple[datetime, datetime]]) -> bool:
-    for (ws, we) in wins:
-        if (s < we) and (e > ws):
-            return True
-    return False
+def _wins_to_i8(wins) -> Tuple[np.ndarray, np.ndarray]:
+    """(start_ns, end_ns) windows -> (starts sorted, running max of ends) int64 arrays."""
+    a = np.asarray(wins, dtype=np.int64)
+    order = np.argsort(a[:, 0], kind='stable')
+    return a[order, 0], np.maximum.accumulate(a[order, 1])
+
+def _overlap_mask(gs_i8: np.ndarray, ge_i8: np.ndarray, ws_i8: np.ndarray, we_runmax: np.ndarray) -> np.ndarray:
+    """Gap i overlaps some window iff a window with
+    start < gap_end has (running max) end > gap_start."""
+    k = np.searchsorted(ws_i8, ge_i8, side='left')
+    return (k > 0) & (we_runmax[np.maximum(k - 1, 0)] > gs_i8)
 
+@lru_cache(maxsize=8)
 def _parse_ignore_cfg(cfg_text: str) -> dict:
-    """Parse scoring.ignore.* from YAML-like text."""
+    """Parse scoring.ignore.* from YAML-like text (memoized per config text)."""
     start_tok, end_tok = 'Fri 22:00', 'Sun 22:00'
     dates = []  # list of (iso_start, iso_end)
     policy = None
     t = cfg_text or ''
-    m = re.search(r'(?m)^\s*weekly_window_utc\s*:\s*"([^"]+)"', t)
+    m = _RE_WEEKLY.search(t)
     if m:
         val = m.group(1).strip()
         parts = [p.strip() for p in val.split('->')]
         if len(parts) == 2 and all(parts):
             start_tok, end_tok = parts[0], parts[1]
-    block = re.search(r'(?ms)^\s*dates_utc\s*:\s*(\n(?:\s*-\s*\[[^]]+\]\s*\n?)+)', t)
+    block = _RE_DATES_BLOCK.search(t)
     if block:
-        for mm in re.finditer(r'-\s*\[\s*"([^"]+)"\s*,\s*"([^"]+)"\s*\]', block.group(1)):
+        for mm in _RE_DATE_ITEM.finditer(block.group(1)):
             dates.append((mm.group(1), mm.group(2)))
-    pol_block = re.search(r'(?ms)^\s*fx_holiday_policy\s*:\s*(\n(?:\s+.+\n?)*)', t)
+    pol_block = _RE_POLICY_BLOCK.search(t)
     if pol_block:
         pb = pol_block.group(1)
         policy = {}
-        m_mode = re.search(r'(?m)^\s*mode\s*:\s*(\w+)\s*$', pb); 
+        m_mode = _RE_POLICY_MODE.search(pb)
         if m_mode: policy['mode'] = m_mode.group(1)
-        m_inc = re.search(r'(?m)^\s*include\s*:\s*\[(.*)\]\s*$', pb)
+        m_inc = _RE_POLICY_INCLUDE.search(pb)
         if m_inc:
             items = [x.strip() for x in m_inc.group(1).split(',') if x.strip()]
             policy['include'] = items
-        m_ext = re.search(r'(?m)^\s*extended\s*:\s*(true|false)\s*$', pb, flags=re.I)
+        m_ext = _RE_POLICY_EXTENDED.search(pb)
         if m_ext: policy['extended'] = (m_ext.group(1).lower()=='true')
     return {'weekly_window': (start_tok, end_tok), 'dates_utc': dates, 'fx_holiday_policy': policy}
 
 def _parse_wd_hhmm(token: str):
     dmap = {"Mon":0,"Tue":1,"Wed":2,"Thu":3,"Fri":4,"Sat":5,"Sun":6}
     token = token.strip()
-    m = re.match(r'^(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s+(\d{1,2}):(\d{2})$', token)
+    m = _RE_WDHM.match(token)
     if not m: return None
     wd = dmap[m.group(1)]; hh = int(m.group(2)); mm = int(m.group(3))
     return wd, hh*60+mm
 
-def _weekly_windows_for_year(year: int, start_tok: str, end_tok: str) -> List[Tuple[datetime,datetime]]:
+@lru_cache(maxsize=64)
+def _weekly_windows_for_year(year: int, start_tok: str, end_tok: str) -> Tuple[Tuple[int,int], ...]:
+    # Windows as (start_ns, end_ns) epoch-ns pairs so the overlap path stays in int64
     st = _parse_wd_hhmm(start_tok); en = _parse_wd_hhmm(end_tok)
-    if not st or not en: return []
+    if not st or not en: return ()
     t = datetime(year-1, 12, 25, 0, 0, tzinfo=timezone.utc)
     stop = datetime(year+1, 1, 5, 0, 0, tzinfo=timezone.utc)
     wins = []
@@ -251,9 +309,9 @@ def _weekly_windows_for_year(year: int, start_tok: str, end_tok: str) -> List[Tu
         we = week_start + timedelta(days=en[0], minutes=en[1])
         if we <= ws:
             we += timedelta(days=7)
-        wins.append((ws, we))
+        wins.append((int(ws.timestamp())*1_000_000_000, int(we.timestamp())*1_000_000_000))
         t += timedelta(days=7)
-    return wins
+    return tuple(wins)
 
 def _tag_explainable(bar_gaps: pd.DataFrame, cfg_text: str) -> pd.DataFrame:
     """Tag weekend/closed-hours by interval overlap; holidays later."""
@@ -264,13 +322,12 @@ def _tag_explainable(bar_gaps: pd.DataFrame, cfg_text: str) -> pd.DataFrame:
     wins = []
     for y in years:
         wins.extend(_weekly_windows_for_year(int(y), cfg['weekly_window'][0], cfg['weekly_window'][1]))
-    bg = bar_gaps.copy()
-    bg['reason'] = None
+    reason = np.full(len(bar_gaps), None, dtype=object)
     if wins:
-        m_w = bg.apply(lambda r: _overlaps_any(r['gap_start'], r['gap_end'], wins), axis=1)
-        if m_w.any():
-            bg.loc[m_w, 'reason'] = 'weekend/closed-hours'
-    return bg
+        ws_i8, we_runmax = _wins_to_i8(wins)
+        m_w = _overlap_mask(_dt_i8(bar_gaps['gap_start']), _dt_i8(bar_gaps['gap_end']), ws_i8, we_runmax)
+        reason = np.where(m_w, 'weekend/closed-hours', reason)
+    return bar_gaps.assign(reason=reason)
 
 # ===================== Scoring (TF-aware) =====================
 
@@ -293,7 +350,8 @@ def _tf_params():
         },
     }
 
-def _score_tf(bars: pd.DataFrame, bar_gaps: pd.DataFrame, tf: str, year: int) -> Dict[str, float|str]:
+def _score_tf(bars: pd.DataFrame, bar_gaps: pd.DataFrame, tf: str, year: int,
+              cal_df: pd.DataFrame | None = None, cal_metrics: dict | None = None) -> Dict[str, float|str]:
     P = _tf_params()
     small_max = int(P["gap_buckets"][tf]["small_max_s"]); long_min = int(P["gap_buckets"][tf]["long_min_s"])
     N = len(bar_gaps)
@@ -310,59 +368,55 @@ def _score_tf(bars: pd.DataFrame, bar_gaps: pd.DataFrame, tf: str, year: int) ->
     gap_mix = 100.0*(0.6*comp_small + 0.4*comp_long)
 
     if N>0:
-        cells = bar_gaps.assign(wd=bar_gaps["gap_start"].dt.weekday, hr=bar_gaps["gap_start"].dt.hour).groupby(["wd","hr"]).size()
-        tot = cells.sum(); p = (cells/tot).values
-        H = float((p*p).sum()); C = int(len(cells))
+        # (weekday, hour) cells as a single small-integer code: bincount
+        # replaces the two-level groupby
+        gs = pd.DatetimeIndex(bar_gaps["gap_start"])
+        counts = np.bincount(gs.weekday.to_numpy()*24 + gs.hour.to_numpy(), minlength=7*24)
+        counts = counts[counts > 0]
+        p = counts / counts.sum()
+        H = float((p*p).sum()); C = int(counts.size)
         normH = (H - 1.0/C)/(1.0 - 1.0/C) if C>1 else 1.0
         hotspots = 100.0*(1.0 - normH)
     else:
         hotspots = 100.0
 
-    bars2 = bars.copy()
-    bars2["range"] = (bars2["high"]-bars2["low"]).abs()
-    p99r = float(bars2["range"].quantile(0.99)) if len(bars2) else 0.0
-    ext = int((bars2["range"] > 5*p99r).sum()) if p99r>0 else 0
+    rng = np.abs(bars["high"].to_numpy() - bars["low"].to_numpy())
+    p99r = float(np.quantile(rng, 0.99)) if rng.size else 0.0
+    ext = int((rng > 5*p99r).sum()) if p99r>0 else 0
     per_k = 10000 if tf=="M1" else 1000
-    rate_per_k = ext / (len(bars2)/per_k) if len(bars2) else 0.0
+    rate_per_k = ext / (rng.size/per_k) if rng.size else 0.0
     extremes = 100.0*(1.0 - min(1.0, rate_per_k / T["extreme_rate_per_k"]))
 
-    if len(bars2):
-        bars2["Month"] = bars2["datetime_utc"].dt.to_period("M").astype(str)
+    if len(bars):
+        # Integer month keys: gap months are always a subset of bar months,
+        # so searchsorted+bincount replaces the string groupby + reindex.
+        months = np.unique(_month_i8(bars["datetime_utc"]))
         if N>0:
-            g2 = bar_gaps.copy(); g2["Month"] = g2["gap_start"].dt.to_period("M").astype(str)
-            monthly = (g2.groupby("Month").size()).reindex(sorted(bars2["Month"].unique()), fill_value=0)
+            gap_m = _month_i8(bar_gaps["gap_start"])
+            monthly = np.bincount(np.searchsorted(months, gap_m), minlength=months.size)
         else:
-            monthly = pd.Series([0]*len(bars2["Month"].unique()), index=sorted(bars2["Month"].unique()))
+            monthly = np.zeros(months.size, dtype=np.int64)
         mu = float(monthly.mean())
-        cv = float((monthly.std(ddof=0)/mu)) if mu>0 else 0.0
+        cv = float((monthly.std()/mu)) if mu>0 else 0.0
     else:
         cv = 0.0
     monthly_score = 100.0*(1.0 - min(1.0, cv / T["monthly_cv"]))
 
-    def _sess(ts):
-        h = ts.hour + ts.minute/60.0
-        asia = (0 <= h < 8); london = (7 <= h < 16); ny = (12 <= h < 21)
-        if asia and london: return "Asia-London overlap"
-        if london and ny:  return "London-NY overlap"
-        if ny: return "NY"
-        if london: return "London"
-        if asia: return "Asia"
-        return "Other"
-    share_other = (bar_gaps["gap_start"].apply(_sess)=="Other").mean() if N>0 else 0.0
+    share_other = (_session_labels(bar_gaps["gap_start"]) == "Other").mean() if N>0 else 0.0
     sessions = 100.0*(1.0 - min(1.0, share_other / T["session_other"]))
 
         # Calendar coverage (anomalies-only) — if calendar file is absent, treat as N/A=100
-    try:
-        cal_df = _load_calendar_df(year)
-    except Exception:
-        cal_df = None
+    if cal_df is None and cal_metrics is None:
+        try:
+            cal_df = _load_calendar_df(year)
+        except Exception:
+            cal_df = None
     if cal_df is None or len(cal_df)==0:
         calendar = 100.0
     else:
-        tmp = bar_gaps.copy(); tmp['reason'] = None
-        tagged = tmp
-        # reuse tagging? anomalies already passed in `bar_gaps` to this function = filtered; so here use them directly
-        _, cal_metrics = _match_calendar_high(bar_gaps.assign(reason=pd.Series([None]*len(bar_gaps))), cal_df, window_sec=60)
+        if cal_metrics is None:
+            # anomalies already passed in `bar_gaps` to this function = filtered; use them directly
+            _, cal_metrics = _match_calendar_high(bar_gaps.assign(reason=pd.Series([None]*len(bar_gaps))), cal_df, window_sec=60)
         coverage = cal_metrics.get('coverage', 0.0)
         # target coverage depends on TF (heuristic): more coarse TF -> higher chance to hit
         target = {'M1':0.10, 'M5':0.20, 'H1':0.30}[tf]
@@ -400,34 +454,68 @@ def _session_label(ts: pd.Timestamp) -> str:
     if asia: return "Asia"
     return "Other"
 
-def build_common_blocks(df: pd.DataFrame, gaps: pd.DataFrame, year: int) -> Dict[str,str]:
-    # normalize UTC
-    cfg_text = _read_config_text()
-    df = _coerce_input_utc(df, cfg_text)
-
-    # TF and gaps
-    tf = _read_runtime_timeframe(cfg_text)
-    bars = _resample_ohlcv(df, tf)
-    bar_g = _bar_gaps(bars, tf)
+def _session_labels(ts) -> np.ndarray:
+    """Vectorized _session_label over a datetime-like column."""
+    dt = pd.DatetimeIndex(ts)
+    h = dt.hour.to_numpy() + dt.minute.to_numpy()/60.0
+    asia = (h >= 0) & (h < 8); london = (h >= 7) & (h < 16); ny = (h >= 12) & (h < 21)
+    return np.select([asia & london, london & ny, ny, london, asia],
+                     ["Asia-London overlap", "London-NY overlap", "NY", "London", "Asia"],
+                     default="Other")
+
+def _sessions_table(labels: np.ndarray) -> str:
+    """Markdown table of session counts, descending (first-seen order on ties)."""
+    cats, first, counts = np.unique(labels, return_index=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    total = int(counts.sum()) or 1
+    return "| Session | Count | % |\n|---|---:|---:|\n" + "\n".join(
+        f"| {cats[i]} | {int(counts[i])} | {100.0*counts[i]/total:.2f}% |" for i in order
+    )
 
-    # Tag weekend by overlap, then holidays by overlap
-    tagged = _tag_explainable(bar_g, cfg_text)
+def _tag_holidays(tagged: pd.DataFrame, cfg_text: str, year: int) -> pd.DataFrame:
+    """Tag FX-holiday overlaps on gaps not already explained as weekend."""
     try:
-        _fx_wins = fx_holidays.fx_holiday_windows(year, cfg_text)
+        _fx_wins = fx_holidays.fx_holiday_windows_ns(year, cfg_text)
     except Exception:
         _fx_wins = []
-    if _fx_wins:
-        m = tagged['reason'].isna() & tagged.apply(lambda r: _overlaps_any(r['gap_start'], r['gap_end'], _fx_wins), axis=1)
-        if m.any(): tagged.loc[m, 'reason'] = 'holiday'
+    if _fx_wins and len(tagged):
+        ws_i8, we_runmax = _wins_to_i8(_fx_wins)
+        m = tagged['reason'].isna().to_numpy() & _overlap_mask(_dt_i8(tagged['gap_start']), _dt_i8(tagged['gap_end']), ws_i8, we_runmax)
+        if m.any(): tagged = tagged.assign(reason=np.where(m, 'holiday', tagged['reason'].to_numpy()))
+    return tagged
+
+class YearlyContext:
+    """Full-year precomputation shared by the per-period context builders.
+
+    Runs the year-invariant pipeline (config read, TZ coercion, resample,
+    gap detection, weekend/holiday tagging, calendar load) once; the monthly
+    builder then slices the tagged frames per month instead of repeating
+    the whole pipeline twelve times.
+    """
+    def __init__(self, df: pd.DataFrame, year: int):
+        self.year = int(year)
+        self.cfg_text = _read_config_text()
+        df = _coerce_input_utc(df, self.cfg_text)
+        self.tf = _read_runtime_timeframe(self.cfg_text)
+        self.bars = _resample_ohlcv(df, self.tf)
+        bar_g = _bar_gaps(self.bars, self.tf)
+        self.tagged = _tag_holidays(_tag_explainable(bar_g, self.cfg_text), self.cfg_text, self.year)
+        try:
+            self.cal_df = _load_calendar_df(self.year)
+        except Exception:
+            self.cal_df = None
+
+def build_common_blocks(df: pd.DataFrame, gaps: pd.DataFrame, year: int) -> Dict[str,str]:
+    ctx = YearlyContext(df, year)
+    return _render_common_blocks(ctx.bars, ctx.tagged, ctx.tf, ctx.year, ctx.cal_df)
+
+def _render_common_blocks(bars: pd.DataFrame, tagged: pd.DataFrame, tf: str, year: int,
+                          cal_df: pd.DataFrame | None) -> Dict[str,str]:
     filtered = tagged[tagged['reason'].isna()].drop(columns=['reason'])
 
     # 1) classification header (no emoji), informative only
     base_min = {"M1":1,"M5":5,"H1":60}[tf]
         # Calendar metrics
-    try:
-        cal_df = _load_calendar_df(year)
-    except Exception:
-        cal_df = None
     _, calm = _match_calendar_high(tagged, cal_df, window_sec=60)
     cov = calm.get('coverage', 0.0)
     total_high = calm.get('total_high_events', 0)
@@ -437,20 +525,17 @@ def build_common_blocks(df: pd.DataFrame, gaps: pd.DataFrame, year: int) -> Dict
         f"Economic Calendar coverage: {100.0*cov:.1f}% (High={total_high}, matched={matched_high})."
     )
 
-    # 2) durations
-    s = filtered["delta_sec"] if len(filtered) else pd.Series([], dtype="int64")
-    b_12 = int(((s>60)&(s<=120)).sum()) if len(s) else 0
-    b_25 = int(((s>120)&(s<=300)).sum()) if len(s) else 0
-    b_660 = int(((s>300)&(s<=3600)).sum()) if len(s) else 0
-    b_gt = int((s>3600).sum()) if len(s) else 0
-    p50 = int(s.quantile(0.5)) if len(s) else 0
-    p90 = int(s.quantile(0.9)) if len(s) else 0
-    p99 = int(s.quantile(0.99)) if len(s) else 0
-    mx = int(s.max()) if len(s) else 0
-    if len(s):
-        mxrow = filtered.loc[s.idxmax()]
+    # 2) durations (bucket counts + percentiles in one pass over the array)
+    arr = filtered["delta_sec"].to_numpy(dtype=np.int64) if len(filtered) else np.empty(0, dtype=np.int64)
+    if arr.size:
+        counts = np.bincount(np.digitize(arr, (60, 120, 300, 3600), right=True), minlength=5)
+        b_12, b_25, b_660, b_gt = int(counts[1]), int(counts[2]), int(counts[3]), int(counts[4])
+        p50, p90, p99 = (int(q) for q in np.quantile(arr, (0.5, 0.9, 0.99)))
+        mx = int(arr.max())
+        mxrow = filtered.iloc[int(arr.argmax())]
         longest = f"Longest gap: {mx}s (from {mxrow['gap_start'].isoformat()} to {mxrow['gap_end'].isoformat()} ; ≈{mx/3600:.2f} hours)."
     else:
+        b_12 = b_25 = b_660 = b_gt = p50 = p90 = p99 = mx = 0
         longest = "Longest gap: n/a"
     durations_section_md = (
         "**Buckets (counts)**  \n"
@@ -460,31 +545,26 @@ def build_common_blocks(df: pd.DataFrame, gaps: pd.DataFrame, year: int) -> Dict
 
     # 3) sessions (on anomalies only)
     if len(filtered):
-        sess = filtered["gap_start"].apply(_session_label).value_counts()
-        total = int(sess.sum()) or 1
-        sessions_table_md = "| Session | Count | % |\n|---|---:|---:|\n" + "\n".join(
-            f"| {k} | {int(v)} | {100.0*float(v)/total:.2f}% |" for k,v in sess.items()
-        )
+        sessions_table_md = _sessions_table(_session_labels(filtered["gap_start"]))
     else:
         sessions_table_md = "_No gaps_"
 
-    # 4) monthly table (rows vs gaps in anomalies)
-    bars2 = bars.copy()
-    bars2["Month"] = bars2["datetime_utc"].dt.to_period("M").astype(str)
+    # 4) monthly table (rows vs gaps in anomalies); Period keys group faster
+    # than per-row strings, and gap months are always a subset of bar months
+    rows_per_month = bars.groupby(bars["datetime_utc"].dt.to_period("M"), observed=True).size()
     if len(filtered):
-        g2 = filtered.copy(); g2["Month"] = g2["gap_start"].dt.to_period("M").astype(str)
-        monthly = (pd.DataFrame({"Rows": bars2.groupby("Month").size(),
-                                 "Gaps": g2.groupby("Month").size()})
-                   .fillna(0).astype(int).reset_index())
+        gaps_per_month = (filtered.groupby(filtered["gap_start"].dt.to_period("M"), observed=True).size()
+                          .reindex(rows_per_month.index, fill_value=0))
     else:
-        monthly = (pd.DataFrame({"Rows": bars2.groupby("Month").size()}).reset_index())
-        monthly["Gaps"] = 0
+        gaps_per_month = pd.Series(0, index=rows_per_month.index)
     monthly_table_md = "| Month | Rows | Gaps |\n|---|---:|---:|\n" + "\n".join(
-        f"| {r['Month']} | {r['Rows']} | {r['Gaps']} |" for _, r in monthly.iterrows()
+        f"| {m} | {r} | {g} |" for m, r, g in
+        zip(rows_per_month.index.astype(str), rows_per_month.to_numpy(), gaps_per_month.to_numpy())
     )
 
-    # Scorecard
-    sc = _score_tf(bars, filtered, tf, year)
+    # Scorecard (reuse the calendar frame and metrics computed above: coverage
+    # only counts anomaly gaps, so `calm` matches what _score_tf would rebuild)
+    sc = _score_tf(bars, filtered, tf, year, cal_df=cal_df, cal_metrics=calm)
     scorecard_md = sc["scorecard_md"]
 
     return {
@@ -496,44 +576,45 @@ def build_common_blocks(df: pd.DataFrame, gaps: pd.DataFrame, year: int) -> Dict
     }
 
 def build_gaps_context(df: pd.DataFrame, gaps: pd.DataFrame, year: int) -> Dict[str,str]:
-    cfg_text = _read_config_text()
-    df = _coerce_input_utc(df, cfg_text)
-    tf = _read_runtime_timeframe(cfg_text)
-    bars = _resample_ohlcv(df, tf)
-    bar_g = _bar_gaps(bars, tf)
-
-    tagged = _tag_explainable(bar_g, cfg_text)
-    try:
-        _fx_wins = fx_holidays.fx_holiday_windows(year, cfg_text)
-    except Exception:
-        _fx_wins = []
-    if _fx_wins is not None and len(_fx_wins)>0:
-        m = tagged['reason'].isna() & tagged.apply(lambda r: _overlaps_any(r['gap_start'], r['gap_end'], _fx_wins), axis=1)
-        if m.any(): tagged.loc[m, 'reason'] = 'holiday'
+    ctx = YearlyContext(df, year)
+    tagged = ctx.tagged
     filtered = tagged[tagged['reason'].isna()].drop(columns=['reason'])
 
     # Sessions table (for anomalies only)
     if len(filtered):
-        sess = filtered["gap_start"].apply(_session_label).value_counts()
-        total = int(sess.sum()) or 1
-        sessions_table_md = "| Session | Count | % |\n|---|---:|---:|\n" + "\n".join(
-            f"| {k} | {int(v)} | {100.0*float(v)/total:.2f}% |" for k,v in sess.items()
-        )
+        sessions_table_md = _sessions_table(_session_labels(filtered["gap_start"]))
     else:
         sessions_table_md = "_No gaps_"
 
-    # Full list
-    lines = ["| # | Start UTC | End UTC | Δ sec |", "|---:|---|---|---:|"]
+    # Full list (ISO strings rendered in C via np.datetime_as_string; gaps are
+    # always UTC so the fixed +00:00 suffix matches Timestamp.isoformat())
+    gaps_full_table_md = "| # | Start UTC | End UTC | Δ sec |\n|---:|---|---|---:|"
     if len(filtered):
-        for i, r in enumerate(filtered.sort_values('gap_start').itertuples(index=False), start=1):
-            lines.append(f"| {i} | {r.gap_start.isoformat()} | {r.gap_end.isoformat()} | {int(r.delta_sec)} |")
-    gaps_full_table_md = "\n".join(lines)
+        gs = _dt_i8(filtered['gap_start']); ge = _dt_i8(filtered['gap_end'])
+        order = np.argsort(gs, kind='stable')
+        starts = np.datetime_as_string(gs[order].view('datetime64[ns]'), unit='s')
+        ends = np.datetime_as_string(ge[order].view('datetime64[ns]'), unit='s')
+        deltas = filtered['delta_sec'].to_numpy()[order]
+        body = "\n".join(f"| {i} | {s}+00:00 | {e}+00:00 | {d} |"
+                         for i, (s, e, d) in enumerate(zip(starts, ends, deltas), 1))
+        gaps_full_table_md += "\n" + body
     return {"sessions_table_md": sessions_table_md, "gaps_full_table_md": gaps_full_table_md}
 
-def build_monthly_context(df: pd.DataFrame, gaps: pd.DataFrame, year: int, month: str) -> Dict[str,str]:
-    dfm = df[df["datetime_utc"].dt.to_period("M").astype(str) == month].copy()
-    # note: gaps are built in build_common_blocks; here we reuse the same logic by slicing df then calling common
-    common = build_common_blocks(dfm if not dfm.empty else df, gaps, year)
+def build_monthly_context(df: pd.DataFrame, gaps: pd.DataFrame, year: int, month: str,
+                          ctx: YearlyContext | None = None) -> Dict[str,str]:
+    if ctx is None:
+        dfm = df[df["datetime_utc"].dt.to_period("M").astype(str) == month].copy()
+        # note: gaps are built in build_common_blocks; here we reuse the same logic by slicing df then calling common
+        common = build_common_blocks(dfm if not dfm.empty else df, gaps, year)
+    else:
+        # Slice the pre-tagged full-year frames on the month key; callers
+        # iterating all 12 months pass one shared YearlyContext(df, year)
+        m_i8 = int(np.datetime64(month, "M").astype("i8"))
+        bars_m = ctx.bars[_month_i8(ctx.bars["datetime_utc"]) == m_i8]
+        tagged_m = ctx.tagged[_month_i8(ctx.tagged["gap_start"]) == m_i8]
+        if bars_m.empty:
+            bars_m, tagged_m = ctx.bars, ctx.tagged  # same fallback as the empty df slice
+        common = _render_common_blocks(bars_m, tagged_m, ctx.tf, ctx.year, ctx.cal_df)
     return {
         "month": month,
         "monthly_table_md": common["monthly_table_md"],